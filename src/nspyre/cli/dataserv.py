@@ -44,6 +44,13 @@ class _DataservCmdPrompt(Cmd):
         # use self.dataserv.datasets['my_dataset'] to access datasets directly
         pdb.set_trace()
 
+    def do_EOF(self, arg_string):
+        """Stop the shell prompt when stdin is closed - the data server keeps
+        running until it receives a kill signal"""
+        _logger.info('stdin closed - stopping the shell prompt.')
+        # notify the command loop to exit
+        return True
+
     def do_quit(self, arg_string):
         """Quit the program"""
         if arg_string:
@@ -106,8 +106,11 @@ class _CustomSock:
         # calculate the payload length and package it into bytes
         msg_len_bytes = len(msg).to_bytes(_HEADER_MSG_LEN, byteorder='little')
 
-        # send the header + payload
-        self.sock_writer.write(msg_len_bytes + msg)
+        # send the header + payload - writelines hands both buffers to the
+        # transport in one call, which (on python >= 3.12) sends them with a single
+        # scatter/gather write instead of first copying the (potentially very
+        # large) payload into a concatenated bytes object
+        self.sock_writer.writelines((msg_len_bytes, msg))
         await self.sock_writer.drain()
 
         _logger.debug(f'Sent [{len(msg)}] bytes to {self.addr}.')
@@ -6,7 +6,6 @@ This can be used to efficiently stream data e.g. over a network connection.
 import io
 from asyncio import Queue
 from pickle import dumps
-from pickle import loads
 from pickle import Pickler
 from pickle import Unpickler
 from pickle import UnpicklingError
@@ -16,6 +15,13 @@ from typing import Optional
 
 from .list import StreamingList
 
+# pickle protocol used on the wire - fixed rather than pickle.HIGHEST_PROTOCOL
+# so that sources and sinks running different Python versions stay compatible;
+# protocol 5 pickles buffer-backed objects (e.g. numpy arrays) without first
+# copying them into an intermediate bytes object (see _Unpickler for how
+# read-only arrays are handled)
+_PICKLE_PROTOCOL = 5
+
 # maximum length of a diff
 _MAX_DIFF = 10e3
 
@@ -58,7 +64,9 @@ class PickleDiff:
                 self.diffs[uid].extend(pd.diffs[uid])
             else:
                 # there is a new streaming object entry, so add it to the self.diffs
-                self.diffs[uid] = pd.diffs[uid]
+                # - copy it so that extending it later doesn't modify pd, which may
+                # still be waiting in a queue to be sent
+                self.diffs[uid] = pd.diffs[uid].copy()
 
     def __len__(self):
         total = 0
@@ -106,7 +114,7 @@ class StreamingPickler(Pickler):
         Args:
             file: file-like object where the pickle will be saved.
         """
-        super().__init__(file)
+        super().__init__(file, protocol=_PICKLE_PROTOCOL)
         # dictionary where the keys are an object uid and the value is a list
         # containing all of the operations that have been performed on the
         # object since the last pickling operation
@@ -116,10 +124,8 @@ class StreamingPickler(Pickler):
         # unique hash for this object
         uid = id(obj)
         if isinstance(obj, StreamingList):
-            # update the internal diffs dictionary
-            self.diff_stream_data[uid] = obj.diff_ops.copy()
-            # reset the object's diffs
-            obj._clear_diff_ops()
+            # move the object's diffs into the internal diffs dictionary
+            self.diff_stream_data[uid] = obj._take_diff_ops()
             # return the uid of the object
             return ('StreamingList', uid)
         else:
@@ -127,7 +133,40 @@ class StreamingPickler(Pickler):
             return None
 
 
-class StreamingUnpickler(Unpickler):
+def _writable_frombuffer(frombuffer):
+    """Wrap numpy's protocol 5 array reconstructor so that it always returns
+    writable arrays.
+
+    Args:
+        frombuffer: numpy's :code:`_frombuffer` function.
+
+    Returns:
+        Wrapped function.
+    """
+
+    def load(*args):
+        arr = frombuffer(*args)
+        # read-only arrays (e.g. from np.frombuffer) are pickled in-band as bytes
+        # and would otherwise be loaded as a read-only view of them
+        if not arr.flags.writeable:
+            arr = arr.copy(order='K')
+        return arr
+
+    return load
+
+
+class _Unpickler(Unpickler):
+    """Unpickler that loads numpy arrays as writable arrays, as they were with
+    pickle protocols before 5."""
+
+    def find_class(self, module, name):
+        obj = super().find_class(module, name)
+        if name == '_frombuffer' and module.split('.')[0] == 'numpy':
+            return _writable_frombuffer(obj)
+        return obj
+
+
+class StreamingUnpickler(_Unpickler):
     """Special unpickler for streamed objects."""
 
     def __init__(self, file, stream_obj_db, diff):
@@ -207,7 +246,7 @@ def serialize_pickle_diff(pickle_diffs: PickleDiff) -> bytes:
     Returns:
         Serialized pickle, diffs.
     """
-    return dumps(pickle_diffs)
+    return dumps(pickle_diffs, protocol=_PICKLE_PROTOCOL)
 
 
 def deserialize_pickle_diff(pickle_diffs: bytes) -> Any:
@@ -219,4 +258,4 @@ def deserialize_pickle_diff(pickle_diffs: bytes) -> Any:
     Returns:
         Dictionary containing the differences since the last pickle.
     """
-    return loads(pickle_diffs)
+    return _Unpickler(io.BytesIO(pickle_diffs)).load()
@@ -75,14 +75,23 @@ class StreamingList(list):
             raise ValueError(f'Invalid index [{idx}].') from err
         self._diff_op('u', idx, self[idx])
 
-    def _diff_op(self, op, *args):
-        """Add an entry to the diff_ops list."""
-        self.diff_ops.append((op,) + tuple(args))
+    def _diff_op(self, *op):
+        """Add an entry to the diff_ops list. The arguments are the operation type
+        followed by the (optional) objects for that operation."""
+        self.diff_ops.append(op)
 
     def _clear_diff_ops(self):
         """Reset the record of operations that have been performed on the list."""
         self.diff_ops.clear()
 
+    def _take_diff_ops(self):
+        """Return the record of operations that have been performed on the list
+        and start a new, empty record. This avoids copying the operations when
+        they are handed off to a pickler."""
+        diff_ops = self.diff_ops
+        self.diff_ops = []
+        return diff_ops
+
     def _regenerate_diffops(self):
         """Generate a new diffops array."""
         self._clear_diff_ops()
@@ -93,7 +102,25 @@ class StreamingList(list):
         """Merge the changes given by diff_ops into the list."""
         if self.diff_ops != []:
             raise ValueError("can't merge because there are local changes.")
+        # runs of inserts at consecutive indices (e.g. from repeated append() calls)
+        # are collected and applied with a single slice assignment
+        run_idx = 0
+        run = []
         for i, op in enumerate(diff_ops):
+            if op[0] == 'i' and type(op[1]) is int and op[1] >= 0:
+                if run and op[1] == run_idx + len(run):
+                    # the insert continues the current run
+                    run.append(op[2])
+                    continue
+                if run:
+                    super().__setitem__(slice(run_idx, run_idx), run)
+                # start a new run
+                run_idx = op[1]
+                run = [op[2]]
+                continue
+            if run:
+                super().__setitem__(slice(run_idx, run_idx), run)
+                run = []
             if op[0] == 'i':
                 self.insert(op[1], op[2], register_diff=False)
             elif op[0] == 'd':
@@ -102,6 +129,8 @@ class StreamingList(list):
                 self.__setitem__(op[1], op[2], register_diff=False)
             else:
                 raise ValueError(f'unrecognized operation [{op}] at index [{i}]')
+        if run:
+            super().__setitem__(slice(run_idx, run_idx), run)
 
     def __add__(self, val):
         """See docs for Python list."""
@@ -154,7 +183,11 @@ class StreamingList(list):
 
     def append(self, val):
         """See docs for Python list."""
-        self.insert(len(self), val)
+        # fast path for the most common operation - equivalent to
+        # self.insert(len(self), val)
+        idx = len(self)
+        super().append(val)
+        self.diff_ops.append(('i', idx, val))
 
     def extend(self, val):
         """See docs for Python list."""
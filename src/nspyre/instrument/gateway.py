@@ -7,6 +7,8 @@ import time
 from inspect import getmembers
 
 import rpyc
+from rpyc.core.stream import SocketStream
+from rpyc.utils.factory import connect_stream
 
 try:
     from ..misc.pint import Q_
@@ -119,10 +121,15 @@ class InstrumentGateway:
         timeout = time.time() + self.conn_timeout
         while True:
             try:
-                # connect to the instrument server rpyc server
-                self._connection = rpyc.connect(
-                    self.addr,
-                    self.port,
+                # connect to the instrument server rpyc server - disable Nagle's
+                # algorithm since the traffic is small request / reply messages
+                # that would otherwise be delayed, and enable keepalive to detect
+                # dead connections
+                stream = SocketStream.connect(
+                    self.addr, self.port, nodelay=True, keepalive=True
+                )
+                self._connection = connect_stream(
+                    stream,
                     config={
                         'allow_pickle': True,
                         'timeout': RPYC_CONN_TIMEOUT,
@@ -4,8 +4,8 @@ This module provides a wrapper around an
 access devices, or command the server to add, remove, or restart devices.
 """
 import logging
+import socket
 import threading
-import time
 from pathlib import Path
 from typing import Any
 from typing import Dict
@@ -85,7 +85,8 @@ class InstrumentServer(ClassicService):
     ):
         """
         Args:
-            port: Port number to use for the RPyC server.
+            port: Port number to use for the RPyC server. If 0, the OS picks a
+                free port when the server is started.
             sync_timeout: Time to wait for requests / function calls to finish.
         """
 
@@ -99,6 +100,12 @@ class InstrumentServer(ClassicService):
         # rpyc server
         self._rpyc_server = None
 
+    @property
+    def port(self) -> int:
+        """Port number of the RPyC server. If the server was created with port 0,
+        this is the port picked by the OS once the server has been started."""
+        return self._port
+
     def add(
         self,
         name: str,
@@ -277,27 +284,38 @@ class InstrumentServer(ClassicService):
             raise InstrumentServerError(
                 'Can\'t start the RPyC server because one is already running.'
             )
+        _logger.info('Starting InstrumentServer RPyC server...')
+        try:
+            self._rpyc_server = ThreadedServer(
+                self,
+                hostname='127.0.0.1',
+                port=self._port,
+                protocol_config={
+                    'allow_pickle': True,
+                    'allow_all_attrs': True,
+                    'allow_setattr': True,
+                    'allow_delattr': True,
+                    'sync_request_timeout': self._sync_timeout,
+                },
+            )
+            # the listening socket is bound on creation - record the port that
+            # was assigned in case port 0 was requested
+            self._port = self._rpyc_server.port
+            # start listening from this thread so that the server is accepting
+            # connections by the time start() returns - note that _listen() is
+            # a private rpyc API (present in rpyc 5.x)
+            self._rpyc_server._listen()
+        except Exception:
+            # leave the server in a state where start() can be retried
+            if self._rpyc_server is not None:
+                self._rpyc_server.close()
+                self._rpyc_server = None
+            raise
         thread = threading.Thread(target=self._rpyc_server_thread)
         thread.start()
-        # wait for the server to start
-        while not (self._rpyc_server and self._rpyc_server.active):
-            time.sleep(0.1)
 
     def _rpyc_server_thread(self):
         """Thread for running the RPyC server asynchronously"""
-        _logger.info('Starting InstrumentServer RPyC server...')
-        self._rpyc_server = ThreadedServer(
-            self,
-            hostname='127.0.0.1',
-            port=self._port,
-            protocol_config={
-                'allow_pickle': True,
-                'allow_all_attrs': True,
-                'allow_setattr': True,
-                'allow_delattr': True,
-                'sync_request_timeout': self._sync_timeout,
-            },
-        )
         self._rpyc_server.start()
         _logger.info('RPyC server stopped.')
         _RPYC_SERVER_STOP_EVENT.set()
@@ -349,6 +367,9 @@ class InstrumentServer(ClassicService):
 
     def on_connect(self, conn: Connection):
         """Called when a client connects to the RPyC server."""
+        # disable Nagle's algorithm so that replies to the client's small
+        # requests aren't delayed
+        conn._channel.stream.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         _logger.info(f'Client {conn} connected.')
 
     def on_disconnect(self, conn: Connection):
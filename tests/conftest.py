@@ -8,53 +8,95 @@ This work is licensed under the terms of the 3-Clause BSD license.
 For a copy, see <https://opensource.org/licenses/BSD-3-Clause>.
 """
 import logging
+import shutil
 import socket
 import subprocess
+import sys
 import time
-from contextlib import closing
 from pathlib import Path
 
 import pytest
 from nspyre import InstrumentGateway
-from nspyre import InstrumentGatewayError
 from nspyre import InstrumentServer
+from nspyre import nspyre_init_logger
+from nspyre.data.server import DATASERV_PORT
 
 HERE = Path(__file__).parent
 DRIVERS = HERE / 'fixtures' / 'drivers'
-
-
-def _free_port():
-    """Return a free port number."""
-    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
-        s.bind(('', 0))
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        return s.getsockname()[1]
-
-
-@pytest.fixture
-def free_port():
-    return _free_port()
-
-
-@pytest.fixture
-def dataserv():
-    """Start a data server if one isn't running."""
-
-    process = subprocess.Popen(['nspyre-dataserv'])
-    time.sleep(1)
+# test devices added by gateway_with_devs - name: (driver file, class name)
+_TEST_DEVS = {
+    'daq': ('fake_daq.py', 'FakeDAQ'),
+    'pel': ('fake_pellicle.py', 'FakePellicle'),
+    'sg': ('fake_sg.py', 'FakeSigGen'),
+}
+# resolve the data server executable once so that Popen doesn't have to search
+# PATH for every launch
+_DATASERV_BIN = shutil.which('nspyre-dataserv') or 'nspyre-dataserv'
+
+
+def _wait_for_port(port, process, timeout=10):
+    """Block until a TCP server is accepting connections on the given local port.
+
+    Args:
+        port: Port to probe.
+        process: Popen object of the server - give up early if it exits.
+        timeout: Time (s) to wait before giving up.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f'Server process exited with return code [{process.returncode}].'
+            )
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f'Server on port [{port}] did not come online.')
+
+
+@pytest.fixture(scope='session')
+def dataserv(tmp_path_factory):
+    """Start a data server for the test session. Tests sharing the server must
+    use distinct data set names. The server logs to a file in a temporary
+    directory rather than stdout."""
+
+    log_dir = tmp_path_factory.mktemp('dataserv')
+    process = subprocess.Popen(
+        [_DATASERV_BIN, '-l', str(log_dir)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(DATASERV_PORT, process)
+    except (RuntimeError, TimeoutError) as err:
+        process.kill()
+        process.wait()
+        # the server's stdout and stderr only go to its log file, so include it
+        # in the error
+        logs = '\n'.join(f.read_text() for f in sorted(log_dir.iterdir()))
+        raise RuntimeError(
+            f'Data server failed to start - logs in [{log_dir}]:\n{logs}'
+        ) from err
 
     yield process
 
-    process.kill()
-    time.sleep(1)
+    # ask the data server to shut down cleanly, and reap the process so it
+    # doesn't linger after the fixture
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def inserv():
-    """Create an instrument server."""
-    port = _free_port()
-
-    inserv = InstrumentServer(port=port)
+    """Create an instrument server for the test session."""
+    # let the OS pick a free port to avoid races with other processes
+    inserv = InstrumentServer(port=0)
     inserv.start()
 
     yield inserv
@@ -64,43 +106,90 @@ def inserv():
 
 
 # depend on inserv to make sure it gets started first
-@pytest.fixture
+@pytest.fixture(scope='session')
 def gateway(inserv):
-    """Return a gateway connected to the instrument server."""
+    """Return a gateway connected to the instrument server. It is shared by the
+    whole test session, so tests that add devices must remove them again (see
+    gateway_with_devs)."""
 
     # ignore logging while we attempt to connect
     logging.disable(logging.CRITICAL)
+    # fail quickly if a request to the test devices hangs rather than waiting
+    # for the default sync timeout
+    gw = InstrumentGateway(port=inserv.port, conn_timeout=1, sync_timeout=5)
+    try:
+        # wait up to 1 second for the instrument server to come online
+        gw.connect()
+    finally:
+        # re-enable logging
+        logging.disable(logging.NOTSET)
 
-    # wait until the server is online
-    counter = 0
-    while True:
-        # wait until the instrument server is online
-        try:
-            with InstrumentGateway(port=inserv._port) as gw:
-                # connection succeeded, so re-enable logging
-                logging.disable(logging.NOTSET)
-
-                yield gw
+    yield gw
 
-                break
-        except InstrumentGatewayError:
-            time.sleep(0.1)
-            # wait up to 1 second before giving up
-            assert counter < 10
-            counter += 1
+    gw.disconnect()
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def gateway_with_devs(gateway):
-    """Return a gateway with initialized test devices."""
+    """Return a gateway with initialized test devices. The devices are shared by
+    the tests in a module, and the instrument server's devices are restored to
+    their original state after the module. Tests that remove or modify the test
+    devices should use gateway_with_fresh_devs instead."""
+
+    # snapshot the devices that were on the server before the module
+    initial_devs = set(gateway._devs)
 
     # add test drivers to instrument server
-    gateway.add('daq', DRIVERS / 'fake_daq.py', 'FakeDAQ')
-    gateway.add('pel', DRIVERS / 'fake_pellicle.py', 'FakePellicle')
-    gateway.add('sg', DRIVERS / 'fake_sg.py', 'FakeSigGen')
+    for name, (file_name, class_name) in _TEST_DEVS.items():
+        gateway.add(name, DRIVERS / file_name, class_name)
 
     yield gateway
 
-    # remove drivers from instrument server
-    for d in list(gateway._devs):
+    # remove any drivers that were added by the fixture / tests
+    for d in set(gateway._devs) - initial_devs:
         gateway.remove(d)
+
+
+@pytest.fixture
+def gateway_with_fresh_devs(gateway_with_devs):
+    """Return a gateway with initialized test devices, which are re-created after
+    the test so that later tests in the module get them in their initial
+    state."""
+
+    yield gateway_with_devs
+
+    devs = set(gateway_with_devs._devs)
+    for name, (file_name, class_name) in _TEST_DEVS.items():
+        if name in devs:
+            gateway_with_devs.restart(name)
+        else:
+            gateway_with_devs.add(name, DRIVERS / file_name, class_name)
+
+
+@pytest.fixture
+def nspyre_log(tmp_path):
+    """Initialize nspyre logging to a temporary log file and return its path.
+    nspyre_init_logger() replaces the root logger handlers (including pytest's)
+    and sys.stderr, so the previous configuration is restored after the test."""
+    root_logger = logging.getLogger()
+    stderr_logger = logging.getLogger('stderr')
+    root_handlers = root_logger.handlers.copy()
+    root_level = root_logger.level
+    stderr_handlers = stderr_logger.handlers.copy()
+    stderr_propagate = stderr_logger.propagate
+    stderr = sys.stderr
+
+    log_path = tmp_path / 'nspyre.log'
+    nspyre_init_logger(logging.DEBUG, log_path=log_path, log_path_level=logging.DEBUG)
+
+    yield log_path
+
+    # close the handlers created by nspyre_init_logger (e.g. the log file)
+    for handler in set(root_logger.handlers + stderr_logger.handlers):
+        if handler not in root_handlers and handler not in stderr_handlers:
+            handler.close()
+    sys.stderr = stderr
+    root_logger.handlers[:] = root_handlers
+    root_logger.setLevel(root_level)
+    stderr_logger.handlers[:] = stderr_handlers
+    stderr_logger.propagate = stderr_propagate
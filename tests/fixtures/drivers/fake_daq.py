@@ -1,12 +1,13 @@
+# channel numbers for all of the digital / analog I/O
+CHANNELS = tuple(range(10))
+
+
 class FakeDAQ:
-    def __init__(self):
-        self._dout = {}
-        for k in range(10):
-            self._dout[k] = False
+    __slots__ = ('_dout', '_aout')
 
-        self._aout = {}
-        for k in range(10):
-            self._aout[k] = 0.0
+    def __init__(self):
+        self._dout = dict.fromkeys(CHANNELS, False)
+        self._aout = dict.fromkeys(CHANNELS, 0.0)
 
     # digital input (assuming they're connected to corresponding dout pins)
     def din(self, key: int):
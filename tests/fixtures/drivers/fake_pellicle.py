@@ -1,4 +1,6 @@
 class FakePellicle:
+    __slots__ = ('_state',)
+
     def __init__(self):
         self._state = False
 
@@ -1,4 +1,11 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
 class FakeSigGen:
+    __slots__ = ('_amplitude', '_frequency', '_output_en', '_waveform')
+
     def __init__(self):
         self._amplitude = 0.0
         self._frequency = 1e3
@@ -30,4 +37,4 @@ class FakeSigGen:
         self._amplitude = value
 
     def calibrate(self):
-        print('sig-gen calibration succeeded')
+        _logger.debug('sig-gen calibration succeeded')
@@ -4,13 +4,64 @@ import time
 import numpy as np
 from nspyre import DataSink
 from nspyre import DataSource
+from nspyre.data.streaming._pickle import PickleDiff
 from nspyre.data.streaming.list import StreamingList
-
-# from nspyre.misc.misc import _total_sizeof
+from nspyre.misc.misc import _total_sizeof
 
 _logger = logging.getLogger(__name__)
 
 NPUSHES = 1000
+# number of pushes between full comparisons of the source and sink data
+CHECK_EVERY = 100
+
+# fixed seed so that failures of the randomized tests can be reproduced - each
+# test creates its own generator so its inputs don't depend on the other tests
+SEED = 0
+
+
+def _random_ops(rng: np.random.Generator, nops: int):
+    """Pre-generate the random inputs for the streaming stress tests.
+
+    Args:
+        rng: Random number generator to draw the inputs from.
+        nops: Number of different operation types.
+
+    Returns:
+        Tuple of lists (sl_idxs, op_idxs, idxs, vals) of length NPUSHES. sl_idxs
+        and idxs contain large random integers to be reduced modulo the length of
+        the object being indexed, op_idxs contains integers in [0, nops), and vals
+        contains integers in [0, 100).
+    """
+    sl_idxs = rng.integers(0, 1_000_000, size=NPUSHES).tolist()
+    op_idxs = rng.integers(0, nops, size=NPUSHES).tolist()
+    idxs = rng.integers(0, 1_000_000, size=NPUSHES).tolist()
+    vals = rng.integers(0, 100, size=NPUSHES).tolist()
+    return sl_idxs, op_idxs, idxs, vals
+
+
+def _do_update(sl: StreamingList, idx: int, val: int):
+    """Reassign the value at a random index of a streaming list."""
+    n = len(sl)
+    if n:
+        sl[idx % (n - 1) if n > 1 else 0] = val
+
+
+def _do_delete(sl: StreamingList, idx: int, val: int):
+    """Delete a random index of a streaming list."""
+    n = len(sl)
+    if n:
+        del sl[idx % (n - 1) if n > 1 else 0]
+
+
+def _do_insert(sl: StreamingList, idx: int, val: int):
+    """Insert a value at a random index of a streaming list."""
+    n = len(sl)
+    sl.insert(idx % n if n > 1 else 0, val)
+
+
+# streaming list operations for the stress tests, indexed by the op_idxs
+# returned by _random_ops
+_OPS = (_do_update, _do_delete, _do_insert)
 
 
 def test_dataserv_streaming_list():
@@ -119,25 +170,73 @@ def test_dataserv_streaming_list():
     assert sl4 == [3, 1, 'a']
 
 
+def test_dataserv_streaming_list_merge():
+    sl = StreamingList()
+    # consecutive inserts, including some past the end of the list
+    sl._merge([('i', 0, 'a'), ('i', 1, 'b'), ('i', 5, 'c'), ('i', 6, 'd')])
+    assert sl == ['a', 'b', 'c', 'd']
+    assert sl.diff_ops == []
+    # runs of inserts broken up by other operations
+    sl._merge(
+        [
+            ('i', 1, 'x'),
+            ('i', 2, 'y'),
+            ('d', 0),
+            ('i', 0, 'z'),
+            ('u', 1, 'w'),
+            ('i', -1, 'v'),
+            ('i', 2, 'q'),
+            ('i', 2, 'r'),
+        ]
+    )
+    assert sl == ['z', 'w', 'r', 'q', 'y', 'b', 'c', 'v', 'd']
+    assert sl.diff_ops == []
+    # the merged list matches the one that generated the diff
+    sl1 = StreamingList([1, 2, 3])
+    sl1.insert(1, 4)
+    sl1.append(5)
+    sl1.append(6)
+    sl1[0] = 7
+    sl2 = StreamingList()
+    sl2._merge(sl1.diff_ops)
+    assert sl2 == sl1
+
+
+def test_dataserv_pickle_diff_squash():
+    pd1 = PickleDiff(b'1', {0: [('i', 0, 'a')]})
+    pd2 = PickleDiff(b'2', {0: [('i', 1, 'b')], 1: [('i', 0, 'c')]})
+    squashed = PickleDiff()
+    squashed.squash(pd1)
+    squashed.squash(pd2)
+    assert squashed.pkl == b'2'
+    assert squashed.diffs == {0: [('i', 0, 'a'), ('i', 1, 'b')], 1: [('i', 0, 'c')]}
+    # squashing must not modify the diffs that were squashed in
+    assert pd1.diffs == {0: [('i', 0, 'a')]}
+    assert pd2.diffs == {0: [('i', 1, 'b')], 1: [('i', 0, 'c')]}
+
+
 def test_dataserv_streaming_push_pop(dataserv):
     name = 'streaming_push_pop'
     with DataSource(name) as source, DataSink(name) as sink:
         sl1 = StreamingList([])
         sl2 = StreamingList([1, 2])
         watched_var = {'sl1': sl1, 'other': 'test', 'sl2': sl2}
-        total_time = 0.0
+        rands = np.random.default_rng(SEED).integers(1000, size=NPUSHES).tolist()
+        total_ns = 0
         for i in range(NPUSHES):
-            rand = np.random.randint(1000)
-            watched_var['sl1'].append(rand)
+            watched_var['sl1'].append(rands[i])
             watched_var['sl2'].append(i + 5)
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             source.push(watched_var)
             sink.pop()
-            end_time = time.time()
-            total_time += end_time - start_time
-            # make sure the data is identical
-            assert watched_var == sink.data
-            _logger.info(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+            total_ns += time.perf_counter_ns() - start_ns
+            # periodically make sure the data is identical
+            if i % CHECK_EVERY == 0:
+                assert watched_var == sink.data
+            _logger.debug(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+        # make sure the data is identical
+        assert watched_var == sink.data
+        total_time = total_ns / 1e9
         avg_time = total_time / NPUSHES
 
     _logger.info(
@@ -146,28 +245,29 @@ def test_dataserv_streaming_push_pop(dataserv):
     )
 
 
-# TODO debug apparent performance issue on this test
-# def test_dataserv_streaming_push_pop_big():
-#     name = 'streaming_push_pop_big'
-#     with DataSource(name) as source, DataSink(name) as sink:
-#         sl1 = StreamingList([])
-#         total_time = 0.0
-#         for i in range(NPUSHES):
-#             sl1.append(np.random.rand(100, 100))
-#             start_time = time.time()
-#             source.push(sl1)
-#             sink.pop()
-#             end_time = time.time()
-#             total_time += end_time - start_time
-#             # make sure the data is identical
-#             for i in range(len(sl1)):
-#                 assert sl1[i].all() == sink.data[i].all()
-#             _logger.info(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
-#         avg_time = total_time / NPUSHES
-#     _logger.info(
-#         f'[{name}] transferred [{_total_sizeof(sink.data)/1e9:.3f}] GB in '
-#         f'[{total_time:.3f}]s, average time per push/pop [{avg_time:.3f}]s.'
-#     )
+def test_dataserv_streaming_push_pop_big(dataserv):
+    name = 'streaming_push_pop_big'
+    with DataSource(name) as source, DataSink(name) as sink:
+        sl1 = StreamingList([])
+        rng = np.random.default_rng(SEED)
+        total_ns = 0
+        for i in range(NPUSHES):
+            sl1.append(rng.random((100, 100)))
+            start_ns = time.perf_counter_ns()
+            source.push(sl1)
+            sink.pop()
+            total_ns += time.perf_counter_ns() - start_ns
+            _logger.debug(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+        # make sure the data is identical
+        for a, b in zip(sl1, sink.data, strict=True):
+            assert np.array_equal(a, b)
+        total_time = total_ns / 1e9
+        avg_time = total_time / NPUSHES
+
+    _logger.info(
+        f'[{name}] transferred [{_total_sizeof(sink.data)/1e9:.3f}] GB in '
+        f'[{total_time:.3f}]s, average time per push/pop [{avg_time:.3f}]s.'
+    )
 
 
 def test_dataserv_streaming_push_pop_stress(dataserv):
@@ -175,43 +275,27 @@ def test_dataserv_streaming_push_pop_stress(dataserv):
     with DataSource(name) as source, DataSink(name) as sink:
         sl1 = StreamingList([])
         watched_var = [sl1]
-        total_time = 0.0
+        # pre-generate the random inputs
+        rng = np.random.default_rng(SEED)
+        sl_idxs, op_idxs, idxs, vals = _random_ops(rng, len(_OPS))
+        total_ns = 0
         for i in range(NPUSHES):
             # pick a random streaming list
-            sl = watched_var[np.random.randint(len(watched_var))]
-            ops = ['update', 'delete', 'insert']
-            # pick a random type of operation
-            op = ops[np.random.randint(len(ops))]
-            if op == 'update':
-                if len(sl):
-                    # reassign a random number at a random index
-                    if len(sl) > 1:
-                        sl[np.random.randint(len(sl) - 1)] = np.random.randint(0, 100)
-                    else:
-                        sl[0] = np.random.randint(0, 100)
-            elif op == 'delete':
-                if len(sl):
-                    # delete a random index
-                    if len(sl) > 1:
-                        sl.__delitem__(np.random.randint(len(sl) - 1))
-                    else:
-                        sl.__delitem__(0)
-            elif op == 'insert':
-                # insert a random number at a random index
-                if len(sl) > 1:
-                    sl.insert(np.random.randint(len(sl)), np.random.randint(0, 100))
-                else:
-                    sl.insert(0, np.random.randint(0, 100))
-
-            start_time = time.time()
+            sl = watched_var[sl_idxs[i] % len(watched_var)]
+            # perform a random type of operation
+            _OPS[op_idxs[i]](sl, idxs[i], vals[i])
+            start_ns = time.perf_counter_ns()
             source.push(watched_var)
             sink.pop()
-            end_time = time.time()
-            total_time += end_time - start_time
+            total_ns += time.perf_counter_ns() - start_ns
 
-            # make sure the data is identical
-            assert watched_var == sink.data
-            _logger.info(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+            # periodically make sure the data is identical
+            if i % CHECK_EVERY == 0:
+                assert watched_var == sink.data
+            _logger.debug(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+        # make sure the data is identical
+        assert watched_var == sink.data
+        total_time = total_ns / 1e9
         avg_time = total_time / NPUSHES
 
     _logger.info(
@@ -225,43 +309,24 @@ def test_dataserv_streaming_multi_push(dataserv):
     with DataSource(name) as source, DataSink(name) as sink:
         sl1 = StreamingList([])
         watched_var = [sl1]
-        start_time = time.time()
+        # pre-generate the random inputs
+        rng = np.random.default_rng(SEED)
+        sl_idxs, op_idxs, idxs, vals = _random_ops(rng, len(_OPS) + 1)
+        start_ns = time.perf_counter_ns()
         i = 0
         while i < NPUSHES:
             # pick a random streaming list
-            sl = watched_var[np.random.randint(len(watched_var))]
-            ops = ['update', 'delete', 'insert', 'newsl']
-            # pick a random type of operation
-            op = ops[np.random.randint(len(ops))]
-            if op == 'update':
-                if len(sl):
-                    # reassign a random number at a random index
-                    if len(sl) > 1:
-                        sl[np.random.randint(len(sl) - 1)] = np.random.randint(0, 100)
-                    else:
-                        sl[0] = np.random.randint(0, 100)
-            elif op == 'delete':
-                if len(sl):
-                    # delete a random index
-                    if len(sl) > 1:
-                        sl.__delitem__(np.random.randint(len(sl) - 1))
-                    else:
-                        sl.__delitem__(0)
-            elif op == 'insert':
-                # insert a random number at a random index
-                if len(sl) > 1:
-                    sl.insert(np.random.randint(len(sl)), np.random.randint(0, 100))
-                else:
-                    sl.insert(0, np.random.randint(0, 100))
-            elif op == 'newsl':
-                watched_var.append(StreamingList([]))
+            sl = watched_var[sl_idxs[i] % len(watched_var)]
+            # perform a random type of operation, or add a new streaming list
+            if op_idxs[i] < len(_OPS):
+                _OPS[op_idxs[i]](sl, idxs[i], vals[i])
             else:
-                raise RuntimeError()
+                watched_var.append(StreamingList([]))
             source.push(watched_var)
-            _logger.info(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
+            _logger.debug(f'Completed [{100*(i+1)/NPUSHES:>5.1f}]%.')
             i += 1
 
-        end_time = time.time()
+        total_ns = time.perf_counter_ns() - start_ns
         while True:
             try:
                 # pop until we have the most recent data
@@ -270,8 +335,8 @@ def test_dataserv_streaming_multi_push(dataserv):
                 break
         # make sure the data is identical
         assert watched_var == sink.data
-        total_time = end_time - start_time
-        avg_time = (end_time - start_time) / NPUSHES
+        total_time = total_ns / 1e9
+        avg_time = total_time / NPUSHES
 
     _logger.info(
         f'Completed run [{name}] - total time [{total_time:.3f}]s, average time per '
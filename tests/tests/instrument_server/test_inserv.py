@@ -4,19 +4,46 @@ This file tests the functionality of the instrument server and gateway.
 Author: Jacob Feder
 Date: 11/12/2020
 """
-import logging
+import socket
 
 import pytest
 from nspyre import InstrumentGateway
 from nspyre import InstrumentGatewayError
+from nspyre import InstrumentServer
+from rpyc.utils.server import ThreadedServer
 
-logger = logging.getLogger(__name__)
+
+def _fail_listen(self):
+    """Replacement for ThreadedServer._listen() that always fails."""
+    raise OSError('listen failed')
 
 
 class TestInserv:
-    def test_connect(self, gateway):
+    def test_connect(self):
         """Test the gateway can connect and have an empty dict of devices"""
-        assert not gateway._devs
+        # use a dedicated server, since the session-wide one may hold devices
+        # added by other tests
+        with InstrumentServer(port=0) as inserv:
+            with InstrumentGateway(port=inserv.port) as gateway:
+                assert not gateway._devs
+
+    def test_start_fail(self, monkeypatch):
+        """Test the server raises an error if it can't listen, and can then be
+        started once the problem is resolved"""
+        with socket.create_server(('127.0.0.1', 0)) as sock:
+            inserv = InstrumentServer(port=sock.getsockname()[1])
+            # the port is already taken
+            with pytest.raises(OSError):
+                inserv.start()
+        # the port is free now, but listening fails
+        with monkeypatch.context() as m:
+            m.setattr(ThreadedServer, '_listen', _fail_listen)
+            with pytest.raises(OSError):
+                inserv.start()
+        inserv.start()
+        with InstrumentGateway(port=inserv.port) as gateway:
+            assert not gateway._devs
+        inserv.stop()
 
     def test_connect_fail(self):
         """Test the gateway returns an error if the ip is wrong"""
@@ -26,15 +53,15 @@ class TestInserv:
 
     def test_device_add_from_file(self, gateway_with_devs):
         """Test the gateway fixture contains drivers that were loaded from files"""
-        assert 'daq' in gateway_with_devs._devs
-        assert 'pel' in gateway_with_devs._devs
-        assert 'sg' in gateway_with_devs._devs
-        assert 'not_a_driver' not in gateway_with_devs._devs
+        # fetch the device names from the server once
+        devs = set(gateway_with_devs._devs)
+        assert {'daq', 'pel', 'sg'} <= devs
+        assert 'not_a_driver' not in devs
 
-    def test_device_mgmt(self, gateway_with_devs):
+    def test_device_mgmt(self, gateway_with_fresh_devs):
         """Test the gateway can restart and remove devices"""
-        gateway_with_devs.restart('daq')
-        assert gateway_with_devs.daq
-        gateway_with_devs.remove('daq')
+        gateway_with_fresh_devs.restart('daq')
+        assert gateway_with_fresh_devs.daq
+        gateway_with_fresh_devs.remove('daq')
         with pytest.raises(AttributeError):
-            gateway_with_devs.daq
+            gateway_with_fresh_devs.daq
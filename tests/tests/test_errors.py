@@ -1,27 +1,17 @@
 import logging
-from pathlib import Path
+import re
 
 import pytest
-from nspyre import nspyre_init_logger
 
 logger_name = 'test_errors'
 logger = logging.getLogger(logger_name)
-HERE = Path(__file__).parent
 
 
 class TestErrors:
-    def test_output(self, gateway):
+    def test_output(self, gateway, nspyre_log):
         """Test that the log files are working properly and receiving all the
         stdout / stderr messages as well."""
 
-        # Generate a temporary log file that can be analyzed by the test
-        log_path = Path(HERE / 'test_errors.log')
-        # Delete the log file if it already exists
-        log_path.unlink(missing_ok=True)
-        nspyre_init_logger(
-            logging.DEBUG, log_path=log_path, log_path_level=logging.DEBUG
-        )
-
         # messages logged in the main / client python instance
         log_messages = []
 
@@ -41,11 +31,12 @@ class TestErrors:
         # log_messages.append('stdout test')
 
         # open the log files
-        with open(log_path) as log_reader:
+        with open(nspyre_log) as log_reader:
             log = log_reader.read()
-            # make sure each message was logged to the file
-            for m in log_messages:
-                assert m in log
+        # make sure each message was logged to the file - find all of them in a
+        # single pass over the log
+        pattern = re.compile('|'.join(re.escape(m) for m in log_messages))
+        assert set(pattern.findall(log)) == set(log_messages)
 
         with pytest.raises(AttributeError):
             gateway.nonexistent_device